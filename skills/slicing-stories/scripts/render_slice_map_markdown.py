@@ -4,50 +4,97 @@ from __future__ import annotations
 import argparse
 import json
 import sys
-from typing import Any
+from itertools import islice
+from typing import Any, Callable, Iterator
+
+
+REQUIRED_TOP_LEVEL_KEYS = frozenset({"meta", "slices"})
+
+SUMMARY_FIELDS = ("id", "title", "story")
+
+SLICE_DETAILS_TEMPLATE = (
+    "\n"
+    "### {id}: {title}\n"
+    "\n"
+    "**Story:** {story}\n"
+    "\n"
+    "**In scope:**\n"
+    "{scope_in}\n"
+    "\n"
+    "**Out of scope:**\n"
+    "{scope_out}\n"
+    "\n"
+    "**Sequence rationale:** {sequence_rationale}"
+)
+
+OPEN_UNKNOWNS_TEMPLATE = "\n**Open unknowns:**\n{open_unknowns}"
+
+_MD_CELL_TRANS = str.maketrans({"\n": " ", "|": "\\|"})
+
+_JSON_ENCODER = json.JSONEncoder(indent=2, ensure_ascii=False)
+
+JSON_CHUNK_TOKENS = 8192
+
+
+def _iter_json(bundle: dict[str, Any]) -> Iterator[str]:
+    # iterencode yields one small token at a time; join them into larger
+    # chunks so streaming does not cost one write() per token.
+    tokens = _JSON_ENCODER.iterencode(bundle)
+    while chunk := "".join(islice(tokens, JSON_CHUNK_TOKENS)):
+        yield chunk
 
 
 def _md_cell(value: Any) -> str:
     if value is None:
         return "—"
+    if type(value) is str:
+        if "\n" in value or "|" in value:
+            value = value.translate(_MD_CELL_TRANS)
+        return value.strip() or "—"
     if isinstance(value, list):
-        value = ", ".join(str(item) for item in value if item is not None)
-    text = str(value).replace("\n", " ").strip()
-    return text.replace("|", "\\|") if text else "—"
+        text = ", ".join(str(item) for item in value if item is not None)
+    else:
+        text = str(value)
+    return text.translate(_MD_CELL_TRANS).strip() or "—"
+
+
+def _md_bullets(items: list[Any]) -> str:
+    return "\n".join([f"- {_md_cell(item)}" for item in items]) or "- —"
+
+
+def _list_field(obj: dict[str, Any], key: str) -> list[Any]:
+    value = obj.get(key)
+    return value if isinstance(value, list) else []
 
 
 def _require_object(bundle: Any) -> dict[str, Any]:
     if not isinstance(bundle, dict):
         raise ValueError("top-level JSON must be an object")
-    for key in ("meta", "slices"):
-        if key not in bundle:
-            raise ValueError(f"missing required top-level key: {key}")
-    if not isinstance(bundle.get("meta"), dict):
+    missing = REQUIRED_TOP_LEVEL_KEYS - bundle.keys()
+    if missing:
+        # min() keeps the report deterministic ("meta" before "slices").
+        raise ValueError(f"missing required top-level key: {min(missing)}")
+    if not isinstance(bundle["meta"], dict):
         raise ValueError("'meta' must be an object")
-    if not isinstance(bundle.get("slices"), list):
+    if not isinstance(bundle["slices"], list):
         raise ValueError("'slices' must be an array")
     return bundle
 
 
-def _render_meta(lines: list[str], meta: dict[str, Any]) -> None:
-    lines.append("## Meta")
-    lines.append(f"- **Project:** {_md_cell(meta.get('project'))}")
-    lines.append(f"- **Source:** {_md_cell(meta.get('source'))}")
-    lines.append(f"- **Generated:** {_md_cell(meta.get('generated_at'))}")
-    lines.append(f"- **Feature summary:** {_md_cell(meta.get('feature_summary'))}")
+def _render_meta(emit: Callable[[str], None], meta: dict[str, Any]) -> None:
+    emit("## Meta")
+    emit(f"- **Project:** {_md_cell(meta.get('project'))}")
+    emit(f"- **Source:** {_md_cell(meta.get('source'))}")
+    emit(f"- **Generated:** {_md_cell(meta.get('generated_at'))}")
+    emit(f"- **Feature summary:** {_md_cell(meta.get('feature_summary'))}")
 
-    assumptions = meta.get("assumptions") if isinstance(meta.get("assumptions"), list) else []
-    lines.append("")
-    lines.append("## Assumptions")
-    if assumptions:
-        for item in assumptions:
-            lines.append(f"- {_md_cell(item)}")
-    else:
-        lines.append("- —")
+    emit("")
+    emit("## Assumptions")
+    emit(_md_bullets(_list_field(meta, "assumptions")))
 
-    open_questions = meta.get("open_questions") if isinstance(meta.get("open_questions"), list) else []
-    lines.append("")
-    lines.append("## Open Questions")
+    open_questions = _list_field(meta, "open_questions")
+    emit("")
+    emit("## Open Questions")
     if open_questions:
         for q in open_questions:
             if not isinstance(q, dict):
@@ -56,90 +103,92 @@ def _render_meta(lines: list[str], meta: dict[str, Any]) -> None:
             blocking = "blocking" if q.get("blocking") else "deferrable"
             owner = _md_cell(q.get("owner"))
             question = _md_cell(q.get("question"))
-            lines.append(f"- **{q_id}** ({blocking}, owner: {owner}): {question}")
+            emit(f"- **{q_id}** ({blocking}, owner: {owner}): {question}")
     else:
-        lines.append("- —")
+        emit("- —")
 
 
-def _render_summary_table(lines: list[str], slices: list[dict[str, Any]]) -> None:
-    lines.append("")
-    lines.append("## Slice Summary")
-    lines.append("")
-    lines.append("| # | ID | Title | Story |")
-    lines.append("|---|---|---|---|")
-    for idx, s in enumerate(slices):
-        num = idx + 1
-        s_id = _md_cell(s.get("id"))
-        title = _md_cell(s.get("title"))
-        story = _md_cell(s.get("story"))
-        lines.append(f"| {num} | {s_id} | {title} | {story} |")
+def _render_summary_table(emit: Callable[[str], None], slices: list[dict[str, Any]]) -> None:
+    emit("")
+    emit("## Slice Summary")
+    emit("")
+    emit("| # | ID | Title | Story |")
+    emit("|---|---|---|---|")
+    for num, s in enumerate(slices, start=1):
+        cells = [str(num)]
+        cells.extend(_md_cell(s.get(field)) for field in SUMMARY_FIELDS)
+        emit("| " + " | ".join(cells) + " |")
 
 
-def _render_slice_details(lines: list[str], slices: list[dict[str, Any]]) -> None:
-    lines.append("")
-    lines.append("## Slice Details")
+def _render_slice_details(emit: Callable[[str], None], slices: list[dict[str, Any]]) -> None:
+    emit("")
+    emit("## Slice Details")
 
     for s in slices:
-        if not isinstance(s, dict):
-            continue
-        lines.append("")
-        lines.append(f"### {_md_cell(s.get('id'))}: {_md_cell(s.get('title'))}")
-        lines.append("")
-        lines.append(f"**Story:** {_md_cell(s.get('story'))}")
-
-        scope_in = s.get("scope_in") if isinstance(s.get("scope_in"), list) else []
-        lines.append("")
-        lines.append("**In scope:**")
-        if scope_in:
-            for item in scope_in:
-                lines.append(f"- {_md_cell(item)}")
-        else:
-            lines.append("- —")
-
-        scope_out = s.get("scope_out") if isinstance(s.get("scope_out"), list) else []
-        lines.append("")
-        lines.append("**Out of scope:**")
-        if scope_out:
-            for item in scope_out:
-                lines.append(f"- {_md_cell(item)}")
-        else:
-            lines.append("- —")
-
-        lines.append("")
-        lines.append(f"**Sequence rationale:** {_md_cell(s.get('sequence_rationale'))}")
-
-        open_unknowns = s.get("open_unknowns") if isinstance(s.get("open_unknowns"), list) else []
+        emit(
+            SLICE_DETAILS_TEMPLATE.format(
+                id=_md_cell(s.get("id")),
+                title=_md_cell(s.get("title")),
+                story=_md_cell(s.get("story")),
+                scope_in=_md_bullets(_list_field(s, "scope_in")),
+                scope_out=_md_bullets(_list_field(s, "scope_out")),
+                sequence_rationale=_md_cell(s.get("sequence_rationale")),
+            )
+        )
+
+        open_unknowns = _list_field(s, "open_unknowns")
         if open_unknowns:
-            lines.append("")
-            lines.append("**Open unknowns:**")
-            for item in open_unknowns:
-                lines.append(f"- {_md_cell(item)}")
+            emit(OPEN_UNKNOWNS_TEMPLATE.format(open_unknowns=_md_bullets(open_unknowns)))
 
 
-def render_slice_map_markdown(bundle: dict[str, Any], *, include_json: bool) -> str:
-    bundle = _require_object(bundle)
+def _iter_markdown_chunks(
+    bundle: dict[str, Any], *, include_json: bool, raw_json: str | None
+) -> Iterator[str]:
     meta = bundle["meta"]
     slices = bundle["slices"]
 
-    project = meta.get("project") if isinstance(meta.get("project"), str) else "TBD"
+    project = meta.get("project")
+    if not isinstance(project, str):
+        project = "TBD"
 
     lines: list[str] = []
-    lines.append(f"# Slice Map — {project}")
-    lines.append("")
-    _render_meta(lines, meta)
+    emit = lines.append
+    emit(f"# Slice Map — {project}")
+    emit("")
+    _render_meta(emit, meta)
     slice_dicts = [s for s in slices if isinstance(s, dict)]
-    _render_summary_table(lines, slice_dicts)
-    _render_slice_details(lines, slice_dicts)
+    _render_summary_table(emit, slice_dicts)
+    _render_slice_details(emit, slice_dicts)
 
     if include_json:
-        lines.append("")
-        lines.append("## Slice Map (JSON)")
-        lines.append("")
-        lines.append("```json")
-        lines.append(json.dumps(bundle, indent=2, ensure_ascii=False))
-        lines.append("```")
+        emit("")
+        emit("## Slice Map (JSON)")
+        emit("")
+        emit("```json")
 
-    return "\n".join(lines).rstrip() + "\n"
+    yield "\n".join(lines) + "\n"
+
+    if include_json:
+        if raw_json is not None:
+            yield raw_json.strip()
+        else:
+            yield from _iter_json(bundle)
+        yield "\n```\n"
+
+
+def iter_slice_map_markdown(
+    bundle: dict[str, Any], *, include_json: bool, raw_json: str | None = None
+) -> Iterator[str]:
+    # Validate eagerly so callers see ValueError before any output is produced.
+    bundle = _require_object(bundle)
+    return _iter_markdown_chunks(bundle, include_json=include_json, raw_json=raw_json)
+
+
+def render_slice_map_markdown(
+    bundle: dict[str, Any], *, include_json: bool, raw_json: str | None = None
+) -> str:
+    chunks = iter_slice_map_markdown(bundle, include_json=include_json, raw_json=raw_json)
+    return "".join(chunks).rstrip() + "\n"
 
 
 def _load_json_text(path: str) -> str:
@@ -155,6 +204,11 @@ def main(argv: list[str]) -> int:
     )
     parser.add_argument("path", nargs="?", default="slice-map.json", help="Path to slice-map.json (or '-' for stdin)")
     parser.add_argument("--no-json", action="store_true", help="Do not embed the JSON at the end of the Markdown output")
+    parser.add_argument(
+        "--verbatim-json",
+        action="store_true",
+        help="Embed the input text as-is instead of re-encoding the parsed JSON (skips the re-encode)",
+    )
     parser.add_argument("--validate", action="store_true", help="Validate the slice map before rendering")
     parser.add_argument("--strict", action="store_true", help="Use strict validation (timestamp format)")
     args = parser.parse_args(argv)
@@ -188,13 +242,16 @@ def main(argv: list[str]) -> int:
         if errors:
             return 1
 
+    raw_json = raw if args.verbatim_json else None
     try:
-        md = render_slice_map_markdown(bundle, include_json=not args.no_json)
+        chunks = iter_slice_map_markdown(bundle, include_json=not args.no_json, raw_json=raw_json)
     except ValueError as e:
         print(f"error: {e}", file=sys.stderr)
         return 2
 
-    sys.stdout.write(md)
+    write = sys.stdout.write
+    for chunk in chunks:
+        write(chunk)
     return 0
 
 
@@ -10,6 +10,8 @@ from typing import Any
 
 ALLOWED_QUESTION_OWNERS = {"product", "engineering", "design", "tbd"}
 
+_ISO_UTC_RE = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z")
+
 
 def _is_str_list(value: Any) -> bool:
     return isinstance(value, list) and all(isinstance(item, str) for item in value)
@@ -19,6 +21,16 @@ def _is_nonempty_str(value: Any) -> bool:
     return isinstance(value, str) and value.strip() != ""
 
 
+def _is_seq_id(value: Any, prefix: str) -> bool:
+    # Same as re.fullmatch(prefix + r"\d{3}", value); str.isdecimal matches \d.
+    return (
+        isinstance(value, str)
+        and len(value) == len(prefix) + 3
+        and value.startswith(prefix)
+        and value[len(prefix):].isdecimal()
+    )
+
+
 def _add_err(errors: list[str], path: str, msg: str) -> None:
     errors.append(f"{path}: {msg}")
 
@@ -38,7 +50,7 @@ def _require_key(
 
 
 def _validate_iso_utc(ts: str) -> bool:
-    return bool(re.fullmatch(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z", ts))
+    return bool(_ISO_UTC_RE.fullmatch(ts))
 
 
 def validate_slice_map(bundle: Any, *, strict: bool) -> tuple[list[str], list[str]]:
@@ -86,7 +98,7 @@ def validate_slice_map(bundle: Any, *, strict: bool) -> tuple[list[str], list[st
                         continue
                     q_id = _require_key(q, "id", path=q_path, errors=errors, expected="string")
                     if q_id is not None:
-                        if not isinstance(q_id, str) or not re.fullmatch(r"Q-\d{3}", q_id):
+                        if not _is_seq_id(q_id, "Q-"):
                             _add_err(errors, f"{q_path}.id", "must match Q-###")
                         elif q_id in q_ids:
                             _add_err(errors, f"{q_path}.id", f"duplicate question id '{q_id}'")
@@ -118,7 +130,7 @@ def validate_slice_map(bundle: Any, *, strict: bool) -> tuple[list[str], list[st
 
             s_id = _require_key(s, "id", path=s_path, errors=errors, expected="string")
             if s_id is not None:
-                if not isinstance(s_id, str) or not re.fullmatch(r"S-\d{3}", s_id):
+                if not _is_seq_id(s_id, "S-"):
                     _add_err(errors, f"{s_path}.id", "must match S-###")
                 elif s_id in slice_ids:
                     _add_err(errors, f"{s_path}.id", f"duplicate slice id '{s_id}'")